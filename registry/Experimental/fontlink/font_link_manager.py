@@ -7,8 +7,10 @@
 
 import winreg
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Set
+from typing import AbstractSet, Dict, List, Optional, Tuple
 from .reg_multi_sz_converter import RegMultiSzConverter
 
 
@@ -16,7 +18,7 @@ class FontLinkManager:
     """字体链接管理器"""
 
     def __init__(self, registry_paths: Dict[str, str], target_fonts: List[str], 
-                 append_fonts: Set[str], font_entries: List[str]):
+                 append_fonts: AbstractSet[str], font_entries: List[str]):
         """
         初始化字体链接管理器
 
@@ -31,6 +33,7 @@ class FontLinkManager:
         self.target_fonts = target_fonts
         self.append_fonts = append_fonts
         self.font_entries = font_entries
+        self._value_cache: Dict[Tuple[str, str], Optional[List[str]]] = {}
 
     def read_registry_value(self, hkey: int, path: str, value_name: str) -> Optional[List[str]]:
         """
@@ -61,184 +64,379 @@ class FontLinkManager:
             print(f"读取注册表失败: {path}\\{value_name} - {e}")
             return None
 
-    def backup_font_links(self, output_file: str) -> bool:
+    def _enumerate_values(self, hkey: int, path: str,
+                          names: List[str]) -> Tuple[Dict[str, List[str]], AbstractSet[str]]:
         """
-        备份字体链接配置到 .reg 文件
+        枚举注册表路径下的所有值
+
+        枚举中途失败时，对 names 中尚未读到的值在同一个句柄上逐个
+        QueryValueEx 补读，避免把实际存在的值误判为不存在
 
         Args:
-            output_file: 输出的 .reg 文件路径
+            hkey: 注册表根键（如 winreg.HKEY_LOCAL_MACHINE）
+            path: 注册表路径
+            names: 需要保证读取到的值名称列表
 
         Returns:
-            备份是否成功
+            (REG_MULTI_SZ 值字典, 其他类型的值名称集合)，值名称均已 casefold，
+            与 Windows 不区分大小写的语义一致
+
+        Raises:
+            OSError: 当注册表路径无法打开时
+        """
+        values: Dict[str, List[str]] = {}
+        other_types = set()
+        with winreg.OpenKey(hkey, path, 0, winreg.KEY_READ) as key:
+            value_count = winreg.QueryInfoKey(key)[1]
+            for i in range(value_count):
+                try:
+                    value_name, value, reg_type = winreg.EnumValue(key, i)
+                except OSError as e:
+                    print(f"枚举注册表值失败: {path} (第 {i + 1}/{value_count} 个) - {e}，改为逐个读取")
+                    break
+
+                if reg_type == winreg.REG_MULTI_SZ:
+                    values[value_name.casefold()] = value
+                else:
+                    other_types.add(value_name.casefold())
+            else:
+                return values, other_types
+
+            for value_name in names:
+                folded = value_name.casefold()
+                if folded in values or folded in other_types:
+                    continue
+                try:
+                    value, reg_type = winreg.QueryValueEx(key, value_name)
+                except FileNotFoundError:
+                    continue
+                except PermissionError:
+                    print(f"权限不足，无法读取: {path}\\{value_name}")
+                    continue
+                except Exception as e:
+                    print(f"读取注册表失败: {path}\\{value_name} - {e}")
+                    continue
+
+                if reg_type == winreg.REG_MULTI_SZ:
+                    values[folded] = value
+                else:
+                    other_types.add(folded)
+        return values, other_types
+
+    def _read_many(self, hkey: int, path: str, names: List[str]) -> Dict[str, Optional[List[str]]]:
+        """
+        枚举一次注册表路径，批量读取多个 REG_MULTI_SZ 值
+
+        Args:
+            hkey: 注册表根键（如 winreg.HKEY_LOCAL_MACHINE）
+            path: 注册表路径
+            names: 值名称列表
+
+        Returns:
+            值名称到字符串列表的字典，不存在或读取失败的值为 None
         """
         try:
-            with open(output_file, 'w', encoding='utf-16le') as f:
-                f.write('\ufeff')
-                f.write('Windows Registry Editor Version 5.00\n\n')
-                f.write(f'; 字体链接配置备份\n')
-                f.write(f'; 备份时间: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}\n\n')
-
-                backup_count = 0
-
-                for arch, reg_path in self.registry_paths.items():
-                    f.write(f'; {arch} 配置\n')
-                    f.write(f'[HKEY_LOCAL_MACHINE\\{reg_path}]\n')
-
-                    path_backup_count = 0
-                    path_delete_count = 0
-
-                    for font_name in self.target_fonts:
-                        font_links = self.read_registry_value(
-                            winreg.HKEY_LOCAL_MACHINE,
-                            reg_path,
-                            font_name
-                        )
-
-                        if font_links is not None:
-                            # 存在的值：正常备份
-                            hex_data = self.converter.encode_to_hex_string(font_links, "regedit")
-                            f.write(f'"{font_name}"={hex_data}\n')
-                            path_backup_count += 1
-                            backup_count += 1
-                            print(f"已备份: [{arch}] {font_name} ({len(font_links)} 个条目)")
-                        else:
-                            # 不存在的值：添加删除条目
-                            f.write(f'"{font_name}"=-\n')
-                            path_delete_count += 1
-                            print(f"已标记删除: [{arch}] {font_name} (原本不存在)")
+            present, other_types = self._enumerate_values(hkey, path, names)
+        except FileNotFoundError:
+            present, other_types = {}, set()
+        except PermissionError:
+            print(f"权限不足，无法读取: {path}")
+            present, other_types = {}, set()
+        except Exception as e:
+            print(f"读取注册表失败: {path} - {e}")
+            present, other_types = {}, set()
 
-                    f.write('\n')
-                    print(f"{arch} 路径处理完成: {path_backup_count} 个备份, {path_delete_count} 个删除标记")
+        for value_name in names:
+            if value_name.casefold() in other_types:
+                print(f"警告: {value_name} 不是 REG_MULTI_SZ 类型")
+        return {name: present.get(name.casefold()) for name in names}
 
-                # 计算不存在的字体数量
-                total_delete_count = sum(
-                    1 for arch in self.registry_paths 
-                    for font in self.target_fonts 
-                    if self.read_registry_value(winreg.HKEY_LOCAL_MACHINE, self.registry_paths[arch], font) is None
-                )
+    def _prefetch_all_archs(self):
+        """
+        并发读取所有架构下尚未缓存的目标字体值
 
-                print(f"\n备份完成！共处理 {backup_count + total_delete_count} 个字体配置到: {output_file}")
-                return True
+        每个架构的注册表路径由单独的线程读取，winreg 的查询会释放 GIL，
+        因此 32 位与 64 位配置可以同时读取。多个架构配置为同一路径时只读取一次
+        """
+        pending = {}
+        for arch in self.registry_paths:
+            missing = self._uncached_fonts(arch)
+            if missing:
+                pending[arch] = missing
+
+        if not pending:
+            return
+
+        # 每个架构实际读取哪个架构的路径（仅当路径字符串完全相同时共享）
+        sources = {}
+        readers = {}
+        for arch, names in pending.items():
+            reader = readers.setdefault(self.registry_paths[arch], arch)
+            sources[arch] = reader if pending[reader] == names else arch
+
+        read_archs = set(sources.values())
+        if len(read_archs) == 1:
+            (arch,) = read_archs
+            results = {arch: self._read_many(
+                winreg.HKEY_LOCAL_MACHINE,
+                self.registry_paths[arch],
+                pending[arch]
+            )}
+        else:
+            with ThreadPoolExecutor(max_workers=len(read_archs)) as executor:
+                futures = {
+                    arch: executor.submit(
+                        self._read_many,
+                        winreg.HKEY_LOCAL_MACHINE,
+                        self.registry_paths[arch],
+                        pending[arch]
+                    )
+                    for arch in read_archs
+                }
+            results = {arch: future.result() for arch, future in futures.items()}
+
+        for arch, source in sources.items():
+            self._store_values(arch, results[source])
+
+    def _uncached_fonts(self, arch: str) -> List[str]:
+        """返回指定架构下尚未缓存的目标字体列表"""
+        return [name for name in self.target_fonts if (arch, name) not in self._value_cache]
+
+    def _store_values(self, arch: str, values: Dict[str, Optional[List[str]]]):
+        """将读取结果写入 (架构, 字体名) 缓存"""
+        for font_name, font_links in values.items():
+            self._value_cache[(arch, font_name)] = font_links
+
+    def _snapshot(self) -> Dict[Tuple[str, str], Optional[List[str]]]:
+        """
+        获取所有架构下目标字体链接值的内存快照
+
+        Returns:
+            以 (架构, 字体名) 为键的字典，不存在或读取失败的字体为 None
+        """
+        self._prefetch_all_archs()
+        return {
+            (arch, name): self._value_cache[(arch, name)]
+            for arch in self.registry_paths
+            for name in self.target_fonts
+        }
+
+    def clear_cache(self):
+        """清除注册表读取缓存，之后的读取将重新访问注册表"""
+        self._value_cache.clear()
+
+    @staticmethod
+    def _write_reg_file(output_file: str, lines: List[str]):
+        """
+        以 UTF-16LE（带 BOM）编码写出 .reg 文件
+
+        内容一次性编码后以二进制写入，所有换行（包括 hex 数据中的续行）
+        统一转换为 regedit 使用的 CRLF
+
+        Args:
+            output_file: 输出文件路径
+            lines: 文件的各行内容（不含行尾换行符）
+        """
+        content = '\n'.join(lines) + '\n'
+        with open(output_file, 'wb') as f:
+            f.write(b'\xff\xfe')
+            f.write(content.replace('\n', '\r\n').encode('utf-16le'))
+
+    def backup_font_links(self, output_file: str,
+                          snapshot: Optional[Dict[Tuple[str, str], Optional[List[str]]]] = None) -> bool:
+        """
+        备份字体链接配置到 .reg 文件
+
+        Args:
+            output_file: 输出的 .reg 文件路径
+            snapshot: 注册表快照（见 _snapshot），为 None 时自动读取
+
+        Returns:
+            备份是否成功
+        """
+        try:
+            parts = [
+                'Windows Registry Editor Version 5.00',
+                '',
+                '; 字体链接配置备份',
+                f'; 备份时间: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}',
+                '',
+            ]
+
+            if snapshot is None:
+                snapshot = self._snapshot()
+
+            encode = self.converter.encode_to_hex_string
+
+            backup_count = 0
+            total_delete_count = 0
+
+            for arch, reg_path in self.registry_paths.items():
+                parts.append(f'; {arch} 配置')
+                parts.append(f'[HKEY_LOCAL_MACHINE\\{reg_path}]')
+
+                path_backup_count = 0
+                path_delete_count = 0
+                log = []
+
+                for font_name in self.target_fonts:
+                    font_links = snapshot[(arch, font_name)]
+
+                    if font_links is not None:
+                        # 存在的值：正常备份
+                        hex_data = encode(font_links, "regedit")
+                        parts.append(f'"{font_name}"={hex_data}')
+                        path_backup_count += 1
+                        backup_count += 1
+                        log.append(f"已备份: [{arch}] {font_name} ({len(font_links)} 个条目)")
+                    else:
+                        # 不存在的值：添加删除条目
+                        parts.append(f'"{font_name}"=-')
+                        path_delete_count += 1
+                        total_delete_count += 1
+                        log.append(f"已标记删除: [{arch}] {font_name} (原本不存在)")
+
+                parts.append('')
+                log.append(f"{arch} 路径处理完成: {path_backup_count} 个备份, {path_delete_count} 个删除标记")
+                sys.stdout.write('\n'.join(log) + '\n')
+
+            self._write_reg_file(output_file, parts)
+
+            print(f"\n备份完成！共处理 {backup_count + total_delete_count} 个字体配置到: {output_file}")
+            return True
 
         except Exception as e:
             print(f"备份失败: {e}")
             return False
 
-    def create_modified_reg(self, backup_file: str, output_file: str) -> bool:
+    def create_modified_reg(self, backup_file: str, output_file: str,
+                            snapshot: Optional[Dict[Tuple[str, str], Optional[List[str]]]] = None) -> bool:
         """
         创建修改后的 .reg 文件，对不同字体使用不同的插入策略
 
         Args:
             backup_file: 备份文件路径
             output_file: 输出文件路径
+            snapshot: 注册表快照（见 _snapshot），为 None 时自动读取
 
         Returns:
             创建是否成功
         """
         try:
-            with open(output_file, 'w', encoding='utf-16le') as f:
-                f.write('\ufeff')
-                f.write('Windows Registry Editor Version 5.00\n\n')
-                f.write(f'; 修改后的字体链接配置\n')
-                f.write(f'; 基于备份文件: {os.path.basename(backup_file)}\n')
-                f.write(f'; 修改时间: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}\n')
-                f.write(f'; 说明: \n')
-                f.write(f';   - 特定字体: 在末尾添加字体条目\n')
-                f.write(f';   - 其他字体: 在开头添加字体条目\n\n')
-
-                modify_count = 0
-
-                for arch, reg_path in self.registry_paths.items():
-                    f.write(f'; {arch} 配置 - 修改版\n')
-                    f.write(f'[HKEY_LOCAL_MACHINE\\{reg_path}]\n')
-
-                    path_modify_count = 0
-
-                    for font_name in self.target_fonts:
-                        font_links = self.read_registry_value(
-                            winreg.HKEY_LOCAL_MACHINE,
-                            reg_path,
-                            font_name
-                        )
-
-                        # 判断是在末尾添加还是在开头添加
-                        append_to_end = font_name in self.append_fonts
-
-                        if font_links is not None:
-                            # 已存在的字体：根据字体类型决定插入位置
-                            if append_to_end:
-                                # 在末尾添加
-                                new_font_links = font_links.copy()
-                                new_font_links.extend(self.font_entries)
-                                insertion_info = "末尾"
-                            else:
-                                # 在开头添加
-                                new_font_links = self.font_entries.copy()
-                                new_font_links.extend(font_links)
-                                insertion_info = "开头"
-
-                            hex_data = self.converter.encode_to_hex_string(new_font_links, "regedit")
-                            f.write(f'"{font_name}"={hex_data}\n')
-                            path_modify_count += 1
-                            modify_count += 1
-
-                            print(f"已修改: [{arch}] {font_name} (在{insertion_info}添加)")
-                            print(f"  原有条目: {len(font_links)} 个")
-                            print(f"  新增条目: {len(self.font_entries)} 个")
-                            print(f"  总计条目: {len(new_font_links)} 个")
+            parts = [
+                'Windows Registry Editor Version 5.00',
+                '',
+                '; 修改后的字体链接配置',
+                f'; 基于备份文件: {os.path.basename(backup_file)}',
+                f'; 修改时间: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}',
+                '; 说明: ',
+                ';   - 特定字体: 在末尾添加字体条目',
+                ';   - 其他字体: 在开头添加字体条目',
+                '',
+            ]
+
+            if snapshot is None:
+                snapshot = self._snapshot()
+
+            # 循环中频繁使用的属性预先绑定为局部变量
+            encode = self.converter.encode_to_hex_string
+            entries = self.font_entries
+            append_set = self.append_fonts
+
+            modify_count = 0
+            # 不存在的字体统一使用相同的新配置，只需编码一次
+            new_config_hex = encode(entries, "regedit")
+
+            for arch, reg_path in self.registry_paths.items():
+                parts.append(f'; {arch} 配置 - 修改版')
+                parts.append(f'[HKEY_LOCAL_MACHINE\\{reg_path}]')
+
+                path_modify_count = 0
+                log = []
+
+                for font_name in self.target_fonts:
+                    font_links = snapshot[(arch, font_name)]
+
+                    # 判断是在末尾添加还是在开头添加
+                    append_to_end = font_name in append_set
+
+                    if font_links is not None:
+                        # 已存在的字体：根据字体类型决定插入位置
+                        if append_to_end:
+                            # 在末尾添加
+                            new_font_links = font_links + entries
+                            insertion_info = "末尾"
                         else:
-                            # 不存在的字体：创建新配置（统一在开头）
-                            hex_data = self.converter.encode_to_hex_string(self.font_entries, "regedit")
-                            f.write(f'"{font_name}"={hex_data}\n')
-                            path_modify_count += 1
-                            modify_count += 1
-                            print(f"已创建: [{arch}] {font_name} (新配置，{len(self.font_entries)} 个条目)")
-
-                    f.write('\n')
-                    print(f"{arch} 路径修改完成: {path_modify_count} 个字体")
-
-                print(f"\n修改版文件创建完成！共处理 {modify_count} 个字体配置")
-                print(f"输出文件: {output_file}")
-                print(f"\n插入策略:")
-                print(f"  末尾添加: {', '.join(sorted(self.append_fonts))}")
-                print(f"  开头添加: 其他所有字体")
-                return True
+                            # 在开头添加
+                            new_font_links = entries + font_links
+                            insertion_info = "开头"
+
+                        hex_data = encode(new_font_links, "regedit")
+                        parts.append(f'"{font_name}"={hex_data}')
+                        path_modify_count += 1
+                        modify_count += 1
+
+                        log.append(f"已修改: [{arch}] {font_name} (在{insertion_info}添加)")
+                        log.append(f"  原有条目: {len(font_links)} 个")
+                        log.append(f"  新增条目: {len(entries)} 个")
+                        log.append(f"  总计条目: {len(new_font_links)} 个")
+                    else:
+                        # 不存在的字体：创建新配置（统一在开头）
+                        parts.append(f'"{font_name}"={new_config_hex}')
+                        path_modify_count += 1
+                        modify_count += 1
+                        log.append(f"已创建: [{arch}] {font_name} (新配置，{len(entries)} 个条目)")
+
+                parts.append('')
+                log.append(f"{arch} 路径修改完成: {path_modify_count} 个字体")
+                sys.stdout.write('\n'.join(log) + '\n')
+
+            self._write_reg_file(output_file, parts)
+
+            print(f"\n修改版文件创建完成！共处理 {modify_count} 个字体配置")
+            print(f"输出文件: {output_file}")
+            print(f"\n插入策略:")
+            print(f"  末尾添加: {', '.join(sorted(append_set))}")
+            print(f"  开头添加: 其他所有字体")
+            return True
 
         except Exception as e:
             print(f"创建修改版文件失败: {e}")
             return False
 
-    def preview_current_config(self):
-        """预览当前的字体链接配置"""
+    def preview_current_config(self, snapshot: Optional[Dict[Tuple[str, str], Optional[List[str]]]] = None):
+        """
+        预览当前的字体链接配置
+
+        Args:
+            snapshot: 注册表快照（见 _snapshot），为 None 时自动读取
+        """
         print("=== 当前字体链接配置 ===\n")
+        if snapshot is None:
+            snapshot = self._snapshot()
 
         for arch, reg_path in self.registry_paths.items():
-            print(f"[{arch.upper()}] {reg_path}")
-            print("-" * 60)
+            log = [f"[{arch.upper()}] {reg_path}", "-" * 60]
 
             found_count = 0
             not_found_count = 0
 
             for font_name in self.target_fonts:
-                font_links = self.read_registry_value(
-                    winreg.HKEY_LOCAL_MACHINE,
-                    reg_path,
-                    font_name
-                )
+                font_links = snapshot[(arch, font_name)]
 
                 if font_links is not None:
                     insertion_strategy = "末尾添加" if font_name in self.append_fonts else "开头添加"
-                    print(f"  {font_name} [{insertion_strategy}]:")
-                    for i, link in enumerate(font_links, 1):
-                        print(f"    {i}. {link}")
+                    log.append(f"  {font_name} [{insertion_strategy}]:")
+                    log.extend(f"    {i}. {link}" for i, link in enumerate(font_links, 1))
                     found_count += 1
                 else:
-                    print(f"  {font_name}: [未找到]")
+                    log.append(f"  {font_name}: [未找到]")
                     not_found_count += 1
-                print()
-            
-            print(f"  统计: {found_count} 个存在, {not_found_count} 个不存在")
-            print()
+                log.append("")
+
+            log.append(f"  统计: {found_count} 个存在, {not_found_count} 个不存在")
+            log.append("")
+            sys.stdout.write('\n'.join(log) + '\n')
 
     def run_full_process(self, backup_filename: Optional[str] = None, 
                         modified_filename: Optional[str] = None) -> bool:
@@ -256,19 +454,23 @@ class FontLinkManager:
         backup_file = backup_filename or f"fontlink_backup_{timestamp}.reg"
         modified_file = modified_filename or f"fontlink_modified_{timestamp}.reg"
 
+        # 每次完整流程都从注册表重新读取，流程内各步骤共享同一份快照
+        self.clear_cache()
+
         try:
             print("1. 预览当前配置...")
-            self.preview_current_config()
+            snapshot = self._snapshot()
+            self.preview_current_config(snapshot=snapshot)
 
             print("2. 备份原始配置...")
-            if not self.backup_font_links(backup_file):
+            if not self.backup_font_links(backup_file, snapshot=snapshot):
                 print("✗ 备份失败")
                 return False
             print(f"✓ 备份成功: {backup_file}")
             print()
 
             print("3. 创建修改版配置...")
-            if not self.create_modified_reg(backup_file, modified_file):
+            if not self.create_modified_reg(backup_file, modified_file, snapshot=snapshot):
                 print("✗ 修改版创建失败")
                 return False
             print(f"✓ 修改版创建成功: {modified_file}")
@@ -24,7 +24,51 @@ Example:
 
 import re
 import sys
-from typing import List, Union
+from functools import lru_cache
+from typing import List, Tuple, Union
+
+
+_HEX_PREFIX = re.compile(r'^hex\(7\):\s*', re.IGNORECASE)
+_HEX_DETECT = re.compile(r'hex\(7\):', re.IGNORECASE)
+_LINE_CONTINUATION = re.compile(r'\\\s*$', re.MULTILINE)
+_WS = re.compile(r'\s')
+
+# 解码时逗号分隔符替换为空格（bytes.fromhex 会拒绝被空格拆开的字节），
+# 并删除 ASCII 空白
+_DECODE_STRIP = str.maketrans(',', ' ', ' \t\r\n\f\v')
+
+
+@lru_cache(maxsize=128)
+def _encode_cached(strings: Tuple[str, ...], format_style: str) -> str:
+    """
+    encode_to_hex_string 的实际实现，按 (字符串元组, 格式样式) 缓存结果
+
+    同一次运行中 64 位与 32 位配置的字体链接通常相同，缓存可避免重复编码
+    """
+    # 结尾的两个 UTF-16LE 空字符直接以字节形式追加，避免再复制一次整个字符串
+    byte_data = '\x00'.join(strings).encode('utf-16le') + b'\x00\x00\x00\x00'
+
+    hex_str = byte_data.hex(',')
+
+    if format_style == "compact":
+        return "hex(7):" + hex_str
+    elif format_style == "regedit":
+        max_line_length = 75
+
+        # 每个字节在 hex_str 中占 "xx," 三个字符，折行位置可直接算出：
+        # 首行前缀 "hex(7):" 占 7 个字符，续行缩进占 2 个字符
+        first_step = (max_line_length - 7 + 1) // 3 * 3
+        line_step = (max_line_length - 2 + 1) // 3 * 3
+
+        lines = [hex_str[:first_step - 1]]
+        lines.extend(
+            hex_str[i:i + line_step - 1]
+            for i in range(first_step, len(hex_str), line_step)
+        )
+
+        return "hex(7):" + ",\\\n  ".join(lines)
+    else:
+        raise ValueError(f"不支持的格式样式: {format_style}")
 
 
 class RegMultiSzConverter:
@@ -43,25 +87,22 @@ class RegMultiSzConverter:
         Raises:
             ValueError: 当输入数据格式无效时
         """
-        hex_data = re.sub(r'^hex\(7\):\s*', '', hex_string, flags=re.IGNORECASE)
-
-        hex_data = re.sub(r'\\\s*\n\s*', '', hex_data)
-        hex_data = re.sub(r'\\\s*$', '', hex_data, flags=re.MULTILINE)
-
-        hex_data = re.sub(r'\s', '', hex_data)
-
-        hex_bytes = [b.strip() for b in hex_data.split(',') if b.strip()]
+        hex_data = _HEX_PREFIX.sub('', hex_string)
+        if '\\' in hex_data:
+            # 只删除行尾的续行反斜杠，其他位置的反斜杠视为无效数据
+            hex_data = _LINE_CONTINUATION.sub('', hex_data)
+        if not hex_data.isascii():
+            # 非 ASCII 空白（如全角空格 U+3000）无法通过转换表删除
+            hex_data = _WS.sub('', hex_data)
+        hex_data = hex_data.translate(_DECODE_STRIP)
 
         try:
-            byte_array = bytearray()
-            for hex_byte in hex_bytes:
-                if hex_byte:
-                    byte_array.append(int(hex_byte, 16))
+            byte_data = bytes.fromhex(hex_data)
         except ValueError as e:
-            raise ValueError(f"无效的十六进制数据: '{hex_byte}' - {e}")
+            raise ValueError(f"无效的十六进制数据: {e}")
 
         try:
-            decoded_string = byte_array.decode('utf-16le')
+            decoded_string = byte_data.decode('utf-16le')
         except UnicodeDecodeError as e:
             raise ValueError(f"UTF-16LE 解码失败: {e}")
 
@@ -89,35 +130,7 @@ class RegMultiSzConverter:
         if not strings:
             raise ValueError("字符串列表不能为空")
 
-        combined_string = '\x00'.join(strings) + '\x00\x00'
-
-        byte_data = combined_string.encode('utf-16le')
-
-        hex_bytes = [f"{b:02x}" for b in byte_data]
-
-        if format_style == "compact":
-            return "hex(7):" + ",".join(hex_bytes)
-        elif format_style == "regedit":
-            result = "hex(7):"
-            line_length = 7
-            max_line_length = 75
-
-            for i, hex_byte in enumerate(hex_bytes):
-                if i == 0:
-                    result += hex_byte
-                    line_length += len(hex_byte)
-                else:
-                    addition = "," + hex_byte
-                    if line_length + len(addition) > max_line_length:
-                        result += ",\\\n  " + hex_byte
-                        line_length = 2 + len(hex_byte)
-                    else:
-                        result += addition
-                        line_length += len(addition)
-
-            return result
-        else:
-            raise ValueError(f"不支持的格式样式: {format_style}")
+        return _encode_cached(tuple(strings), format_style)
 
     @staticmethod
     def is_hex_data(text: str) -> bool:
@@ -130,7 +143,7 @@ class RegMultiSzConverter:
         Returns:
             如果是 hex(7): 格式返回 True，否则返回 False
         """
-        return bool(re.search(r'hex\(7\):', text, re.IGNORECASE))
+        return bool(_HEX_DETECT.search(text))
 
 
 def decode_registry_hex(hex_string: str) -> List[str]:
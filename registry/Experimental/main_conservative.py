@@ -85,7 +85,7 @@ def get_planschrift_config():
         "PlanschriftP2-Regular.ttf,Planschrift P2",
     ]
 
-    return registry_paths, target_fonts, append_fonts, planschrift_entries
+    return registry_paths, target_fonts, frozenset(append_fonts), planschrift_entries
 
 def main():
     print("字体链接配置备份和修改工具")